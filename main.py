@@ -1,96 +1,380 @@
 import cv2
 import numpy as np
 import pytesseract
+import heapq
+import itertools
+import multiprocessing
 import os
+import queue
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import av
+except ImportError:
+    av = None
+
+# Minimum face area, in original-resolution pixels, for a face to count as large
+LARGE_FACE_AREA = 50000
+
+# Gaps between sampled frames longer than this (in frames) are seeked over rather
+# than decoded. Seeking restarts decoding at the previous keyframe, so it only
+# pays off when the gap is longer than a typical GOP (10 s at 30 fps).
+MAX_GRAB_GAP = 300
+
+# Per-process bot used by the scoring workers, created by _init_worker
+_worker_bot = None
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _fused_metrics(gray):
+        """
+        Compute Laplacian variance and left/right symmetry diff in one pass
+        
+        Matches cv2.Laplacian (ksize=1, BORDER_REFLECT_101) and the squared
+        half-frame difference used by get_symmetry.
+        
+        Args:
+            gray (numpy.ndarray): Grayscale image frame
+        
+        Returns:
+            tuple: Laplacian variance and mean squared symmetry diff
+        """
+        h, w = gray.shape
+        half = w // 2
+        lap_sum = 0.0
+        lap_sq_sum = 0.0
+        sym_sum = 0.0
+        for y in numba.prange(h):
+            up = y - 1 if y > 0 else 1
+            down = y + 1 if y < h - 1 else h - 2
+            for x in range(w):
+                left = x - 1 if x > 0 else 1
+                right = x + 1 if x < w - 1 else w - 2
+                lap = (np.int32(gray[up, x]) + np.int32(gray[down, x]) +
+                       np.int32(gray[y, left]) + np.int32(gray[y, right]) -
+                       4 * np.int32(gray[y, x]))
+                lap_sum += lap
+                lap_sq_sum += lap * lap
+            for x in range(half):
+                d = np.int32(gray[y, x]) - np.int32(gray[y, w - 1 - x])
+                sym_sum += d * d
+        n = h * w
+        lap_mean = lap_sum / n
+        return lap_sq_sum / n - lap_mean * lap_mean, sym_sum / (h * half)
+else:
+    _fused_metrics = None
+
+
+def _init_worker(video_path, output_dir, work_width, gpu_cascade_path, gpu_slots):
+    """
+    Create the scoring bot (and its face cascade) once per worker process
+    
+    Args:
+        video_path (str): Path to the anime movie video file
+        output_dir (str): Directory to save wallpaper frames
+        work_width (int): Frame width used when computing metrics
+        gpu_cascade_path (str): CUDA-format face cascade, or None
+        gpu_slots (multiprocessing.Semaphore): Limits how many workers use the GPU
+    """
+    global _worker_bot
+    # Frames are already spread across processes, so keep OpenCV, Numba and the
+    # PyAV decoder to one thread each rather than cpu_count threads per worker
+    cv2.setNumThreads(1)
+    if numba is not None:
+        numba.set_num_threads(1)
+    _worker_bot = AnimeWallpaperBot(video_path, output_dir, work_width,
+                                    gpu_cascade_path=gpu_cascade_path)
+    _worker_bot.decoder_threads = 1
+    # Each GPU worker holds its own CUDA context, so only a few get one
+    if gpu_slots.acquire(block=False):
+        _worker_bot._init_gpu()
+
+
+def _worker_context():
+    """
+    Multiprocessing context for the scoring pools
+    
+    Workers are started with forkserver (or spawn where it is unavailable)
+    rather than forked, since the parent may be running decoder threads.
+    
+    Returns:
+        multiprocessing.context.BaseContext: Start-method context
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _score_frame(frame):
+    """
+    Score a frame with the worker process's bot
+    
+    Args:
+        frame (numpy.ndarray): Input image frame
+    
+    Returns:
+        float: Beauty score
+    """
+    return _worker_bot.compute_beauty_score(frame)
+
+
+def _score_range(start, end, max_candidates):
+    """
+    Decode and score a frame range with the worker process's bot
+    
+    Args:
+        start (int): First frame index of the range
+        end (int): Frame index the range stops before
+        max_candidates (int): Number of best frames to keep
+    
+    Returns:
+        list: (score, frame index, frame) entries for the best frames
+    """
+    candidates = []
+
+    # Decode the next frame while the current one is being scored
+    reader = FrameReader(_worker_bot, start, end)
+    reader.start()
+    for frame_idx, frame in reader:
+        score = _worker_bot.compute_beauty_score(frame)
+        if score > 0:
+            AnimeWallpaperBot._push_candidate(candidates, (score, frame_idx, frame), max_candidates)
+    reader.join()
+    return candidates
+
 
 class AnimeWallpaperBot:
-    def __init__(self, video_path, output_dir='wallpapers'):
+    def __init__(self, video_path, output_dir='wallpapers', work_width=640, image_format='png',
+                 gpu_cascade_path=None, max_gpu_workers=1):
         """
         Initialize the bot with video path and output directory
         
         Args:
             video_path (str): Path to the anime movie video file
             output_dir (str): Directory to save wallpaper frames
+            work_width (int): Frame width used when computing metrics
+            image_format (str): Wallpaper file format, 'png' or 'jpg' ('jpeg' is accepted)
+            gpu_cascade_path (str): Old-format face cascade for CUDA detection, such as
+                OpenCV's data/haarcascades_cuda/haarcascade_frontalface_default.xml
+            max_gpu_workers (int): Number of scoring processes allowed to use CUDA
         """
         self.video_path = video_path
         self.output_dir = output_dir
+        self.work_width = work_width
+        self.gpu_cascade_path = gpu_cascade_path
+        self.max_gpu_workers = max_gpu_workers
+
+        # Fast PNG compression (the default level is the slowest part of saving)
+        # or high-quality JPEG
+        image_format = image_format.lower().lstrip('.')
+        if image_format == 'jpeg':
+            image_format = 'jpg'
+        if image_format == 'jpg':
+            self.imwrite_params = [cv2.IMWRITE_JPEG_QUALITY, 95]
+        elif image_format == 'png':
+            self.imwrite_params = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+        else:
+            raise ValueError(f"Unsupported image format {image_format!r}, expected 'png' or 'jpg'")
+        self.image_format = image_format
+        self.ocr_max_dim = 1000
+
+        # PyAV decoder thread count, 0 lets FFmpeg pick one per core
+        self.decoder_threads = 0
+
+        # LRU cache of OCR results keyed by perceptual hash
+        self._ocr_cache = OrderedDict()
+        self._ocr_cache_size = 256
         
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
         
         # Load anime face detection cascade
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        self.face_cascade = cv2.CascadeClassifier(cascade_path)
+
+        # CUDA kernels, set up by _init_gpu in the process that scores frames
+        self.gpu_cascade = None
+        self.gpu_canny = None
+        self._gpu_initialized = False
+
+        # Device buffer reused between frames to avoid a GPU allocation per upload
+        self._gpu_gray = None
+        self._gpu_gray_src = None
+
+    def _init_gpu(self):
+        """
+        Use CUDA face detection and Canny when OpenCV was built with CUDA
+        
+        Only called in the process that scores frames: probing initializes the
+        CUDA driver. The CUDA cascade loader only accepts old-format cascades,
+        not the bundled ones, so face detection stays on the CPU unless
+        gpu_cascade_path is set.
+        """
+        if self._gpu_initialized:
+            return
+        self._gpu_initialized = True
 
-    def get_sharpness(self, frame):
+        try:
+            has_cuda = cv2.cuda.getCudaEnabledDeviceCount() > 0
+        except (AttributeError, cv2.error):
+            has_cuda = False
+
+        # Set up each separately: a cascade the CUDA loader rejects should not
+        # also disable CUDA Canny
+        if has_cuda and self.gpu_cascade_path:
+            try:
+                self.gpu_cascade = cv2.cuda_CascadeClassifier.create(self.gpu_cascade_path)
+                self.gpu_cascade.setScaleFactor(1.1)
+                self.gpu_cascade.setMinNeighbors(5)
+            except (AttributeError, cv2.error):
+                self.gpu_cascade = None
+
+        if has_cuda:
+            try:
+                self.gpu_canny = cv2.cuda.createCannyEdgeDetector(100, 200)
+            except (AttributeError, cv2.error):
+                self.gpu_canny = None
+
+    def _upload_gray(self, gray):
+        """
+        Upload a grayscale frame to the reusable GPU buffer
+        
+        Consecutive calls with the same frame only upload it once.
+        
+        Args:
+            gray (numpy.ndarray): Grayscale image frame
+        
+        Returns:
+            cv2.cuda_GpuMat: Device copy of the frame
+        """
+        if self._gpu_gray is None:
+            self._gpu_gray = cv2.cuda_GpuMat()
+        if self._gpu_gray_src is not gray:
+            self._gpu_gray.upload(gray)
+            self._gpu_gray_src = gray
+        return self._gpu_gray
+
+    def get_sharpness(self, gray):
         """
         Compute image sharpness using Laplacian variance
         
         Args:
-            frame (numpy.ndarray): Input image frame
+            gray (numpy.ndarray): Grayscale image frame
         
         Returns:
             float: Sharpness score
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        return cv2.Laplacian(gray, cv2.CV_64F).var()
+        # uint8 input fits in CV_16S, and meanStdDev reduces it in a single pass
+        lap = cv2.Laplacian(gray, cv2.CV_16S)
+        _, std = cv2.meanStdDev(lap)
+        return float(std[0, 0]) ** 2
 
-    def get_color_variance(self, frame):
+    def get_color_variance(self, hsv):
         """
         Compute color variance in HSV color space
         
         Args:
-            frame (numpy.ndarray): Input image frame
+            hsv (numpy.ndarray): HSV image frame
         
         Returns:
             float: Color variance score
         """
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        hue = hsv[:, :, 0]
-        return hue.var()
+        # Per-channel stats in one pass; only the hue channel is used
+        _, std = cv2.meanStdDev(hsv)
+        return float(std[0, 0]) ** 2
 
-    def get_edge_density(self, frame):
+    def get_edge_density(self, gray):
         """
         Compute edge density using Canny edge detection
         
         Args:
-            frame (numpy.ndarray): Input image frame
+            gray (numpy.ndarray): Grayscale image frame
         
         Returns:
             float: Edge density score
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, 100, 200)
-        return edges.sum() / (edges.shape[0] * edges.shape[1])
+        if self.gpu_canny is not None:
+            # Count on the device so the edge map is never downloaded
+            edges = self.gpu_canny.detect(self._upload_gray(gray))
+            num_edges = cv2.cuda.countNonZero(edges)
+        else:
+            edges = cv2.Canny(gray, 100, 200)
+            num_edges = cv2.countNonZero(edges)
+        # Canny edges are 0 or 255, so this matches the mean edge intensity
+        return 255.0 * num_edges / gray.size
 
-    def get_symmetry(self, frame):
+    def get_symmetry(self, gray):
         """
         Compute frame symmetry by comparing left and right halves
         
         Args:
-            frame (numpy.ndarray): Input image frame
+            gray (numpy.ndarray): Grayscale image frame
         
         Returns:
             float: Symmetry score
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        left = gray[:, :gray.shape[1]//2]
-        right = cv2.flip(gray[:, gray.shape[1]//2:], 1)
-        diff = ((left - right) ** 2).mean()
-        return 1 / (1 + diff)
+        half = gray.shape[1] // 2
+        left = gray[:, :half]
+        right = cv2.flip(gray[:, gray.shape[1] - half:], 1)
+        # Squared difference summed in OpenCV, avoiding uint8 wraparound
+        diff = cv2.norm(left, right, cv2.NORM_L2SQR) / left.size
+        return 1.0 / (1.0 + diff)
 
-    def detect_faces(self, frame):
+    def detect_faces(self, gray):
         """
         Detect faces in the frame
         
+        Args:
+            gray (numpy.ndarray): Grayscale image frame
+        
+        Returns:
+            numpy.ndarray: Nx4 int32 array of (x, y, w, h) face boxes
+        """
+        if self.gpu_cascade is not None:
+            objects = self.gpu_cascade.detectMultiScale(self._upload_gray(gray))
+            faces = self.gpu_cascade.convert(objects)
+        else:
+            faces = self.face_cascade.detectMultiScale(gray, 1.1, 5)
+        # detectMultiScale returns an empty tuple when nothing is found
+        return np.asarray(faces, dtype=np.int32).reshape(-1, 4)
+
+    def _phash(self, frame):
+        """
+        Compute a 64-bit DCT-based perceptual hash of the frame
+        
         Args:
             frame (numpy.ndarray): Input image frame
         
         Returns:
-            tuple: Number of faces and list of face sizes
+            int: Perceptual hash
+        """
+        small = cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        dct = cv2.dct(np.float32(gray))
+        low = dct[:8, :8]
+        bits = low > np.median(low)
+        return int(np.packbits(bits).view(np.uint64)[0])
+
+    @staticmethod
+    def _hamming_distance(h1, h2):
+        """
+        Count the differing bits between two perceptual hashes
+        
+        Args:
+            h1 (int): First hash
+            h2 (int): Second hash
+        
+        Returns:
+            int: Hamming distance
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, 1.1, 5)
-        return len(faces), [w * h for (x, y, w, h) in faces]
+        return bin(h1 ^ h2).count('1')
 
     def has_text(self, frame):
         """
@@ -102,12 +386,32 @@ class AnimeWallpaperBot:
         Returns:
             bool: True if text is detected, False otherwise
         """
+        # Reuse the result of a near-identical frame that was already OCR'd
+        frame_hash = self._phash(frame)
+        cached = min(self._ocr_cache, default=None,
+                     key=lambda h: self._hamming_distance(h, frame_hash))
+        if cached is not None and self._hamming_distance(cached, frame_hash) < 6:
+            self._ocr_cache.move_to_end(cached)
+            return self._ocr_cache[cached]
+
+        # Tesseract cost scales with pixel count, so cap the longest side
+        h, w = frame.shape[:2]
+        if max(h, w) > self.ocr_max_dim:
+            scale = self.ocr_max_dim / max(h, w)
+            frame = cv2.resize(frame, (max(int(w * scale), 1), max(int(h * scale), 1)),
+                               interpolation=cv2.INTER_AREA)
+
         try:
             text = pytesseract.image_to_string(frame)
-            return len(text.strip()) > 0
         except:
             return False
 
+        found = len(text.strip()) > 0
+        self._ocr_cache[frame_hash] = found
+        if len(self._ocr_cache) > self._ocr_cache_size:
+            self._ocr_cache.popitem(last=False)
+        return found
+
     def compute_beauty_score(self, frame):
         """
         Compute overall beauty score for a frame
@@ -118,12 +422,41 @@ class AnimeWallpaperBot:
         Returns:
             float: Beauty score
         """
-        # Skip frames with text or low sharpness
-        if self.has_text(frame) or self.get_sharpness(frame) < 100:
+        # Score a downscaled copy; the original frame is kept for saving
+        h, w = frame.shape[:2]
+        if w > self.work_width:
+            small = cv2.resize(frame, (self.work_width, max(int(self.work_width * h / w), 1)),
+                               interpolation=cv2.INTER_AREA)
+        else:
+            small = frame
+
+        # Face sizes are measured on the small frame, map them back to the original
+        area_scale = (h * w) / (small.shape[0] * small.shape[1])
+
+        # Convert once and share the buffers across all metrics
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        # Sharpness and symmetry share a single pass over the frame when Numba is
+        # available. The kernel's border reflection needs at least 2 rows and columns.
+        if _fused_metrics is not None and min(gray.shape) >= 2:
+            sharpness, symmetry_diff = _fused_metrics(gray)
+        else:
+            sharpness, symmetry_diff = self.get_sharpness(gray), None
+
+        # Skip frames with low sharpness; text is checked later on the top candidates only
+        if sharpness < 100:
             return -1
 
-        num_faces, face_sizes = self.detect_faces(frame)
-        num_large_faces = sum(1 for size in face_sizes if size > 50000)
+        if symmetry_diff is not None:
+            symmetry = 1.0 / (1.0 + symmetry_diff)
+        else:
+            symmetry = self.get_symmetry(gray)
+
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+
+        faces = self.detect_faces(gray)
+        face_sizes = faces[:, 2] * faces[:, 3]
+        num_large_faces = int(np.count_nonzero(face_sizes > LARGE_FACE_AREA / area_scale))
 
         # Weights for different features
         w_faces = 0.5
@@ -132,52 +465,353 @@ class AnimeWallpaperBot:
         w_symmetry = 0.1
 
         score = (w_faces * num_large_faces) + \
-                (w_color * self.get_color_variance(frame)) + \
-                (w_edge * self.get_edge_density(frame)) + \
-                (w_symmetry * self.get_symmetry(frame))
+                (w_color * self.get_color_variance(hsv)) + \
+                (w_edge * self.get_edge_density(gray)) + \
+                (w_symmetry * symmetry)
 
         return score
 
-    def extract_wallpapers(self, num_wallpapers=10):
+    def _worker_initargs(self, context):
+        """
+        Build the _init_worker arguments for a scoring pool
+        
+        Args:
+            context (multiprocessing.context.BaseContext): Context the pool is started with
+        
+        Returns:
+            tuple: Arguments for _init_worker
+        """
+        return (self.video_path, self.output_dir, self.work_width, self.gpu_cascade_path,
+                context.Semaphore(self.max_gpu_workers))
+
+    def _open_video(self):
+        """
+        Open the video, preferring FFmpeg hardware-accelerated decoding
+        
+        Returns:
+            cv2.VideoCapture: Opened video capture
+        """
+        # Hardware decode properties are only available in OpenCV 4.5.2+
+        if hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+            video = cv2.VideoCapture(self.video_path, cv2.CAP_FFMPEG, [
+                cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+            ])
+            if video.isOpened():
+                return video
+            video.release()
+
+        return cv2.VideoCapture(self.video_path)
+
+    def _decode_capture(self, start=0, end=None):
+        """
+        Decode one frame per second from a frame range with OpenCV
+        
+        Args:
+            start (int): First frame index of the range
+            end (int): Frame index the range stops before, defaults to the end of the video
+        
+        Yields:
+            tuple: Frame index and frame
+        """
+        video = self._open_video()
+        try:
+            fps = max(int(video.get(cv2.CAP_PROP_FPS)), 1)
+
+            # Align to the same 1-per-second grid regardless of where the range starts
+            start = -(-start // fps) * fps
+
+            # Extract 1 frame per second. Skipped frames are grabbed (decoded without
+            # conversion) rather than seeked over, since a seek re-decodes the GOP
+            # Without an explicit end, read until decoding fails: CAP_PROP_FRAME_COUNT
+            # is only an estimate, and is 0 or garbage for streams without an index
+            pos = 0
+            sample_idxs = itertools.count(start, fps) if end is None else range(start, end, fps)
+            for frame_idx in sample_idxs:
+                if frame_idx - pos > MAX_GRAB_GAP:
+                    video.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                else:
+                    for _ in range(frame_idx - pos):
+                        if not video.grab():
+                            return
+                ret, frame = video.read()
+                if not ret:
+                    break
+                pos = frame_idx + 1
+                yield frame_idx, frame
+        finally:
+            video.release()
+
+    def _decode_av(self, start=0, end=None):
+        """
+        Decode one frame per second from a frame range with PyAV
+        
+        Every frame is decoded in a threaded FFmpeg decoder, but only the
+        sampled ones are converted to BGR arrays.
+        
+        Args:
+            start (int): First frame index of the range
+            end (int): Frame index the range stops before, defaults to the video length
+        
+        Yields:
+            tuple: Frame index and frame
+        """
+        with av.open(self.video_path) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = 'AUTO'
+            if self.decoder_threads:
+                stream.codec_context.thread_count = self.decoder_threads
+
+            rate = float(stream.average_rate or 1)
+            fps = max(int(rate), 1)
+            # Timestamps may not start at zero; index frames from the stream start
+            # so they line up with OpenCV's 0-based frame positions
+            start_pts = stream.start_time or 0
+            if end is None:
+                end = stream.frames or None
+
+            # Jump to the keyframe before the range instead of decoding from the start
+            if start > 0:
+                container.seek(start_pts + int(start / rate / stream.time_base), stream=stream)
+
+            frame_idx = -1
+            for frame in container.decode(stream):
+                if frame.pts is not None:
+                    frame_idx = round(float((frame.pts - start_pts) * stream.time_base) * rate)
+                else:
+                    frame_idx += 1
+                if end is not None and frame_idx >= end:
+                    break
+                if frame_idx < start or frame_idx % fps:
+                    continue
+                yield frame_idx, frame.to_ndarray(format='bgr24')
+
+    def _sample_frames(self, start=0, end=None):
+        """
+        Yield one frame per second from a frame range, skipping near-duplicates
+        
+        PyAV is used for decoding when it is installed, OpenCV otherwise.
+        
+        Args:
+            start (int): First frame index of the range
+            end (int): Frame index the range stops before, defaults to the video length
+        
+        Yields:
+            tuple: Frame index and frame
+        """
+        recent_hashes = deque(maxlen=10)
+
+        decode = self._decode_av if av is not None else self._decode_capture
+        for frame_idx, frame in decode(start, end):
+            # Skip near-duplicates of recently scored frames
+            frame_hash = self._phash(frame)
+            if any(self._hamming_distance(frame_hash, h) < 8 for h in recent_hashes):
+                continue
+            recent_hashes.append(frame_hash)
+
+            yield frame_idx, frame
+
+    @staticmethod
+    def _push_candidate(candidates, entry, max_candidates):
+        """
+        Add a (score, frame index, frame) entry to a bounded min-heap
+        
+        Args:
+            candidates (list): Min-heap of the best entries so far
+            entry (tuple): Entry to add
+            max_candidates (int): Maximum heap size
+        """
+        if len(candidates) < max_candidates:
+            heapq.heappush(candidates, entry)
+        else:
+            heapq.heappushpop(candidates, entry)
+
+    def _save_wallpapers(self, candidates, num_wallpapers):
+        """
+        Drop candidates containing text and save the best remaining frames
+        
+        Args:
+            candidates (list): (score, frame index, frame) entries
+            num_wallpapers (int): Number of top wallpapers to save
+        
+        Returns:
+            list: List of tuples (frame, score)
+        """
+        top_frames = []
+        saves = []
+
+        # Encoding releases the GIL, so saves overlap with OCR of the next candidates
+        with ThreadPoolExecutor() as save_pool:
+            # OCR is expensive, so only the best candidates are checked for text
+            for score, _, frame in sorted(candidates, reverse=True):
+                if self.has_text(frame):
+                    continue
+
+                i = len(top_frames)
+                filename = os.path.join(self.output_dir,
+                                        f'wallpaper_{i}_score_{score:.2f}.{self.image_format}')
+                saves.append((filename, save_pool.submit(cv2.imwrite, filename, frame,
+                                                         self.imwrite_params)))
+
+                top_frames.append((frame, score))
+                if len(top_frames) == num_wallpapers:
+                    break
+
+            # Save wallpapers
+            for filename, future in saves:
+                future.result()
+                print(f"Saved wallpaper: {filename}")
+
+        return top_frames
+
+    def extract_wallpapers(self, num_wallpapers=10, num_workers=1):
         """
         Extract wallpaper-worthy frames from the video
         
+        Frames are decoded on a reader thread and scored in this process, or
+        by a pool of worker processes when num_workers is above 1. Worker
+        processes re-import the calling script, so it must guard its entry
+        point with `if __name__ == "__main__":`.
+        
         Args:
             num_wallpapers (int): Number of top wallpapers to extract
+            num_workers (int): Number of scoring processes, None for the CPU count
         
         Returns:
             list: List of tuples (frame, score)
         """
-        video = cv2.VideoCapture(self.video_path)
-        frames_with_scores = []
-        count = 0
+        num_workers = num_workers or os.cpu_count() or 1
 
-        while video.isOpened():
-            ret, frame = video.read()
-            if not ret:
-                break
+        # Min-heap of the best (score, frame index, frame) candidates; the index
+        # breaks ties so frames are never compared. Twice the target size is
+        # kept to leave room for frames rejected by the text check.
+        candidates = []
+        max_candidates = 2 * num_wallpapers
+
+        reader = FrameReader(self, maxsize=32)
+        reader.start()
+
+        def collect(frame_idx, frame, score):
+            if score > 0:
+                self._push_candidate(candidates, (score, frame_idx, frame), max_candidates)
+
+        if num_workers == 1:
+            if self.max_gpu_workers > 0:
+                self._init_gpu()
+            for frame_idx, frame in reader:
+                collect(frame_idx, frame, self.compute_beauty_score(frame))
+        else:
+            context = _worker_context()
+            with ProcessPoolExecutor(max_workers=num_workers, mp_context=context,
+                                     initializer=_init_worker,
+                                     initargs=self._worker_initargs(context)) as pool:
+                # Bound the number of in-flight frames so memory stays flat
+                pending = deque()
+                for frame_idx, frame in reader:
+                    pending.append((frame_idx, frame, pool.submit(_score_frame, frame)))
+                    if len(pending) >= 2 * num_workers:
+                        frame_idx, frame, future = pending.popleft()
+                        collect(frame_idx, frame, future.result())
 
-            # Extract 1 frame per second
-            if count % int(video.get(cv2.CAP_PROP_FPS)) == 0:
-                score = self.compute_beauty_score(frame)
-                if score > 0:
-                    frames_with_scores.append((frame, score))
+                while pending:
+                    frame_idx, frame, future = pending.popleft()
+                    collect(frame_idx, frame, future.result())
 
-            count += 1
+        reader.join()
 
+        return self._save_wallpapers(candidates, num_wallpapers)
+
+    def extract_wallpapers_parallel(self, num_wallpapers=10, num_workers=None):
+        """
+        Extract wallpaper-worthy frames by splitting the video into chunks
+        
+        Each worker process opens its own capture, seeks to the start of its
+        frame range and decodes and scores it independently. Worker processes
+        re-import the calling script, so it must guard its entry point with
+        `if __name__ == "__main__":`.
+        
+        Args:
+            num_wallpapers (int): Number of top wallpapers to extract
+            num_workers (int): Number of chunks and processes, defaults to the CPU count
+        
+        Returns:
+            list: List of tuples (frame, score)
+        """
+        num_workers = num_workers or os.cpu_count() or 1
+        max_candidates = 2 * num_wallpapers
+
+        video = self._open_video()
+        num_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
         video.release()
 
-        # Sort frames by beauty score and select top wallpapers
-        frames_with_scores.sort(key=lambda x: x[1], reverse=True)
-        top_frames = frames_with_scores[:num_wallpapers]
+        # Chunking needs a usable frame count; streams without an index report
+        # 0 or garbage, so read those with a single reader instead
+        if num_workers == 1 or num_frames <= 0:
+            return self.extract_wallpapers(num_wallpapers, num_workers)
 
-        # Save wallpapers
-        for i, (frame, score) in enumerate(top_frames):
-            filename = os.path.join(self.output_dir, f'wallpaper_{i}_score_{score:.2f}.png')
-            cv2.imwrite(filename, frame)
-            print(f"Saved wallpaper: {filename}")
+        bounds = [i * num_frames // num_workers for i in range(num_workers + 1)]
+        ranges = [(bounds[i], bounds[i + 1], max_candidates) for i in range(num_workers)]
 
-        return top_frames
+        context = _worker_context()
+        with context.Pool(num_workers, initializer=_init_worker,
+                          initargs=self._worker_initargs(context)) as pool:
+            results = pool.starmap(_score_range, ranges)
+            # Shut down cleanly; the terminate() on exit can leak the pool's semaphores
+            pool.close()
+            pool.join()
+
+        # Frame indices are unique across chunks, so they still break score ties
+        candidates = heapq.nlargest(max_candidates, (entry for chunk in results for entry in chunk))
+
+        return self._save_wallpapers(candidates, num_wallpapers)
+
+class FrameReader(threading.Thread):
+    def __init__(self, bot, start=0, end=None, maxsize=2):
+        """
+        Initialize a background thread that decodes sampled frames ahead of the consumer
+        
+        Args:
+            bot (AnimeWallpaperBot): Bot whose video is sampled
+            start (int): First frame index of the range
+            end (int): Frame index the range stops before, defaults to the video length
+            maxsize (int): Number of decoded frames buffered ahead
+        """
+        super().__init__(daemon=True)
+        self.bot = bot
+        self.start_frame = start
+        self.end_frame = end
+        self.q = queue.Queue(maxsize=maxsize)
+        self.error = None
+
+    def run(self):
+        """
+        Decode the sampled frames into the buffer, ending with a None sentinel
+        """
+        try:
+            for item in self.bot._sample_frames(self.start_frame, self.end_frame):
+                self.q.put(item)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.q.put(None)
+
+    def __iter__(self):
+        """
+        Yield buffered frames until the range is exhausted
+        
+        Yields:
+            tuple: Frame index and frame
+        
+        Raises:
+            Exception: Any error raised while decoding
+        """
+        while True:
+            item = self.q.get()
+            if item is None:
+                break
+            yield item
+
+        if self.error is not None:
+            raise self.error
 
 def main():
     # Example usage